@@ -1,45 +1,165 @@
 import os
-import json
+import numpy as np
 import pandas as pd
-from flask import Flask, jsonify, request
+import orjson
+import pyarrow as pa
+from flask import Flask, Response, jsonify, request
 from flask_cors import CORS
 import logging
+from functools import lru_cache
+from data_processor import build_mask, category_means, load_data, numba_mean
 
 # Initialize logging
 logging.basicConfig(level=logging.DEBUG)
+logging.getLogger('numba').setLevel(logging.WARNING)
 
 # Initialize Flask app
 app = Flask(__name__)
 CORS(app, resources={r"/api/*": {"origins": ["https://datadashpro-frontend.windsurf.build", "https://datadashpro-frontend.onrender.com", "http://localhost:3000"], "methods": ["GET", "POST", "OPTIONS"], "allow_headers": ["Content-Type"]}})
 
-# Load and preprocess data
+# Load preprocessed data (run convert.py to rebuild the Parquet file from the CSV)
 DATA_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'data', 'CleanedData.csv')
+PARQUET_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'data', 'Cleaned.parquet')
 try:
-    df = pd.read_csv(DATA_PATH)
+    if os.path.exists(PARQUET_PATH) and os.path.getmtime(PARQUET_PATH) >= os.path.getmtime(DATA_PATH):
+        df = pd.read_parquet(PARQUET_PATH, engine='pyarrow')
+    else:
+        logging.warning(f"{PARQUET_PATH} is missing or older than {DATA_PATH}, cleaning the CSV instead")
+        df = load_data(DATA_PATH)
+    # Sorted by Job Title so each domain is one contiguous row range (see JOB_SLICES)
+    df = df.sort_values(['Job Title', 'Location'], na_position='first').reset_index(drop=True)
     logging.info(f"Successfully loaded data with {len(df)} records")
 
-    # Data Cleaning and Preprocessing
-    df = df.fillna({'min_salary': 0, 'max_salary': 0, 'avg_salary': 0})
-    for col in ['min_salary', 'max_salary', 'avg_salary']:
-        df[col] = pd.to_numeric(df[col], errors='coerce')
-    mask = (df['avg_salary'] == 0) & (df['min_salary'] > 0) & (df['max_salary'] > 0)
-    df.loc[mask, 'avg_salary'] = (df.loc[mask, 'min_salary'] + df.loc[mask, 'max_salary']) / 2
-    df['Location'] = df['Location'].str.split(',').str[0].str.strip()
-    df['Job Title'] = df['Job Title'].str.strip()
-
 except Exception as e:
     logging.error(f"Error loading or processing data: {e}")
     df = pd.DataFrame()
 
 
+# Group once so the key factorization is shared by every aggregation below
+try:
+    GB_JOB = df.groupby('Job Title', sort=False, observed=True)
+    JOB_COUNTS = df['Job Title'].value_counts()
+    JOB_SET = set(df['Job Title'].cat.categories)
+    LOC_SET = set(df['Location'].cat.categories)
+    JOB_SLICES = {name: slice(*np.searchsorted(df['Job Title'].cat.codes.values, [code, code + 1]))
+                  for code, name in enumerate(df['Job Title'].cat.categories)}
+except Exception as e:
+    logging.error(f"Error grouping data: {e}")
+    GB_JOB = JOB_COUNTS = None
+    JOB_SET = LOC_SET = set()
+    JOB_SLICES = {}
+
+
+# Precompute aggregations once at startup; the dataset never changes after load
+PRECOMPUTED = {}
+PRECOMPUTED_JSON = {}
+
+
+def precompute(name, build):
+    try:
+        PRECOMPUTED[name] = build()
+        PRECOMPUTED_JSON[name] = dumps_json(PRECOMPUTED[name])
+    except Exception as e:
+        logging.error(f"Error precomputing {name}: {e}")
+
+
+def top_counts(series, n=5):
+    # value_counts on a categorical also lists unobserved categories with a zero count
+    counts = series.value_counts().head(n)
+    return counts[counts > 0].to_dict()
+
+
+def dumps_json(obj):
+    return orjson.dumps(obj, option=orjson.OPT_SERIALIZE_NUMPY)
+
+
+def dumps_arrow(frame):
+    # Arrow IPC stream: each column is sent as one contiguous buffer. Unused categories are
+    # dropped first so a narrow slice does not carry the full label dictionaries.
+    frame = frame.assign(**{col: frame[col].cat.remove_unused_categories()
+                            for col in frame.select_dtypes('category').columns})
+    table = pa.Table.from_pandas(frame, preserve_index=False)
+    sink = pa.BufferOutputStream()
+    with pa.ipc.new_stream(sink, table.schema) as writer:
+        writer.write_table(table)
+    return sink.getvalue().to_pybytes()
+
+
+def cached_response(name):
+    return Response(PRECOMPUTED_JSON[name], mimetype='application/json')
+
+
+precompute('top_domains', lambda: JOB_COUNTS.head(10)
+           .rename_axis('domain').reset_index(name='count').to_dict(orient='records'))
+precompute('salary_insights', lambda: category_means(df['Job Title'], df['avg_salary'])
+           .sort_values(ascending=False).head(10)
+           .rename_axis('domain').reset_index(name='avg_salary').to_dict(orient='records'))
+precompute('jobs_by_city', lambda: df['Location'].value_counts().head(10)
+           .rename_axis('city').reset_index(name='count').to_dict(orient='records'))
+precompute('domains', lambda: df['Job Title'].cat.categories.tolist())
+precompute('company_hiring', lambda: df['Company'].value_counts().head(10)
+           .rename_axis('company').reset_index(name='count').to_dict(orient='records'))
+precompute('salary_ranges', lambda: GB_JOB[['min_salary', 'max_salary', 'avg_salary']].agg(
+    numba_mean, engine='numba', engine_kwargs={'nopython': True, 'nogil': True, 'parallel': True}
+).sort_index().reset_index().to_dict(orient='records'))
+precompute('locations', lambda: df['Location'].cat.categories.tolist())
+precompute('key_insights', lambda: {
+    'top_paying_domain': category_means(df['Job Title'], df['avg_salary']).sort_values(ascending=False).head(1).index[0] if not df.empty else None,
+    'top_hiring_domain': JOB_COUNTS.index[0] if not df.empty else None,
+    'top_hiring_company': df['Company'].value_counts().index[0] if not df.empty else None,
+    'top_location': df['Location'].value_counts().index[0] if not df.empty else None,
+    'avg_internship_salary': df['avg_salary'].astype('float64').mean() if not df.empty else 0,
+    'total_companies': df['Company'].nunique() if not df.empty else 0,
+    'total_domains': df['Job Title'].nunique() if not df.empty else 0,
+    'total_listings': len(df)
+})
+
+
+# Per-domain summaries for compare-domains, built in a single pass over the groups.
+# Salaries are stored as float32; means are taken in float64 to match category_means.
+def summarize_domain(rows):
+    return {
+        'count': len(rows),
+        'avg_salary': rows['avg_salary'].astype('float64').mean(),
+        'min_salary': rows['min_salary'].astype('float64').mean(),
+        'max_salary': rows['max_salary'].astype('float64').mean(),
+        'top_companies': top_counts(rows['Company']),
+        'top_locations': top_counts(rows['Location'])
+    }
+
+
+PER_DOMAIN = {}
+try:
+    for name, grp in GB_JOB:
+        PER_DOMAIN[name] = summarize_domain(grp)
+except Exception as e:
+    logging.error(f"Error summarizing domains: {e}")
+
+
+# Filter kernel over the category codes, warmed up so no request pays for JIT compilation
+def category_code(series, value):
+    # -1 selects every row; callers validate value against JOB_SET/LOC_SET first
+    if value == 'All':
+        return -1
+    return series.cat.categories.get_loc(value)
+
+
+def filter_mask(rows, job_code, loc_code, min_salary):
+    return build_mask(rows['Job Title'].cat.codes.values, rows['Location'].cat.codes.values,
+                      rows['avg_salary'].values, job_code, loc_code, min_salary)
+
+
+try:
+    filter_mask(df, -1, -1, -np.inf)
+except Exception as e:
+    logging.error(f"Error compiling filter kernel: {e}")
+
+
 # API endpoint to get top domains (job titles)
 @app.route('/api/top-domains', methods=['GET'])
 def get_top_domains():
     try:
-        domain_counts = df['Job Title'].value_counts().reset_index()
-        domain_counts.columns = ['domain', 'count']
-        top_domains = domain_counts.head(10).to_dict(orient='records')
-        return jsonify(top_domains)
+        return cached_response('top_domains')
     except Exception as e:
         logging.error(f"Error in get_top_domains: {e}")
         return jsonify({"error": str(e)}), 500
@@ -49,10 +169,7 @@ def get_top_domains():
 @app.route('/api/salary-insights', methods=['GET'])
 def get_salary_insights():
     try:
-        salary_insights = df.groupby('Job Title')['avg_salary'].mean().reset_index()
-        salary_insights.columns = ['domain', 'avg_salary']
-        salary_insights = salary_insights.sort_values('avg_salary', ascending=False)
-        return jsonify(salary_insights.head(10).to_dict(orient='records'))
+        return cached_response('salary_insights')
     except Exception as e:
         logging.error(f"Error in get_salary_insights: {e}")
         return jsonify({"error": str(e)}), 500
@@ -62,9 +179,7 @@ def get_salary_insights():
 @app.route('/api/jobs-by-city', methods=['GET'])
 def get_jobs_by_city():
     try:
-        location_counts = df['Location'].value_counts().reset_index()
-        location_counts.columns = ['city', 'count']
-        return jsonify(location_counts.head(10).to_dict(orient='records'))
+        return cached_response('jobs_by_city')
     except Exception as e:
         logging.error(f"Error in get_jobs_by_city: {e}")
         return jsonify({"error": str(e)}), 500
@@ -74,8 +189,7 @@ def get_jobs_by_city():
 @app.route('/api/domains', methods=['GET'])
 def get_domains():
     try:
-        domains = df['Job Title'].unique().tolist()
-        return jsonify(domains)
+        return cached_response('domains')
     except Exception as e:
         logging.error(f"Error in get_domains: {e}")
         return jsonify({"error": str(e)}), 500
@@ -85,9 +199,7 @@ def get_domains():
 @app.route('/api/company-hiring', methods=['GET'])
 def get_company_hiring():
     try:
-        company_counts = df['Company'].value_counts().reset_index()
-        company_counts.columns = ['company', 'count']
-        return jsonify(company_counts.head(10).to_dict(orient='records'))
+        return cached_response('company_hiring')
     except Exception as e:
         logging.error(f"Error in get_company_hiring: {e}")
         return jsonify({"error": str(e)}), 500
@@ -97,39 +209,50 @@ def get_company_hiring():
 @app.route('/api/salary-ranges', methods=['GET'])
 def get_salary_ranges():
     try:
-        salary_ranges = df.groupby('Job Title').agg({
-            'min_salary': 'mean',
-            'max_salary': 'mean',
-            'avg_salary': 'mean'
-        }).reset_index()
-        return jsonify(salary_ranges.to_dict(orient='records'))
+        return cached_response('salary_ranges')
     except Exception as e:
         logging.error(f"Error in get_salary_ranges: {e}")
         return jsonify({"error": str(e)}), 500
 
 
+# Responses below are pure functions of their normalized arguments over the static data
+@lru_cache(maxsize=512)
+def filter_payload(domain, location, min_salary):
+    # The JOB_SLICES slice already holds only the requested domain, so the kernel skips that check
+    rows = df if domain == 'All' else df.iloc[JOB_SLICES[domain]]
+    mask = filter_mask(rows, -1, category_code(rows['Location'], location), min_salary)
+    return dumps_arrow(rows[mask])
+
+
+@lru_cache(maxsize=512)
+def compare_payload(domain1, domain2):
+    return dumps_json({
+        'domain1': {'name': domain1, **PER_DOMAIN[domain1]},
+        'domain2': {'name': domain2, **PER_DOMAIN[domain2]}
+    })
+
+
 # API endpoint to get filtered data
 @app.route('/api/filter-data', methods=['GET'])
 def filter_data():
     try:
-        domain = request.args.get('domain')
-        location = request.args.get('location')
+        domain = request.args.get('domain') or 'All'
+        location = request.args.get('location') or 'All'
         min_salary = request.args.get('min_salary')
 
-        filtered_df = df.copy()
-
-        if domain and domain != 'All':
-            filtered_df = filtered_df[filtered_df['Job Title'] == domain]
-        if location and location != 'All':
-            filtered_df = filtered_df[filtered_df['Location'] == location]
+        if domain != 'All' and domain not in JOB_SET:
+            return jsonify({"error": "Unknown domain"}), 400
+        if location != 'All' and location not in LOC_SET:
+            return jsonify({"error": "Unknown location"}), 400
         if min_salary:
             try:
                 min_salary = float(min_salary)
-                filtered_df = filtered_df[filtered_df['avg_salary'] >= min_salary]
             except ValueError:
                 return jsonify({"error": "Invalid min_salary value"}), 400
+        else:
+            min_salary = -np.inf
 
-        return jsonify(filtered_df.to_dict(orient='records'))
+        return Response(filter_payload(domain, location, min_salary), mimetype='application/vnd.apache.arrow.stream')
     except Exception as e:
         logging.error(f"Error in filter_data: {e}")
         return jsonify({"error": str(e)}), 500
@@ -144,32 +267,10 @@ def compare_domains():
 
         if not domain1 or not domain2:
             return jsonify({"error": "Both domains are required for comparison"}), 400
+        if domain1 not in JOB_SET or domain2 not in JOB_SET:
+            return jsonify({"error": "Unknown domain"}), 400
 
-        domain1_data = df[df['Job Title'] == domain1]
-        domain2_data = df[df['Job Title'] == domain2]
-
-        comparison = {
-            'domain1': {
-                'name': domain1,
-                'count': len(domain1_data),
-                'avg_salary': domain1_data['avg_salary'].mean(),
-                'min_salary': domain1_data['min_salary'].mean(),
-                'max_salary': domain1_data['max_salary'].mean(),
-                'top_companies': domain1_data['Company'].value_counts().head(5).to_dict(),
-                'top_locations': domain1_data['Location'].value_counts().head(5).to_dict()
-            },
-            'domain2': {
-                'name': domain2,
-                'count': len(domain2_data),
-                'avg_salary': domain2_data['avg_salary'].mean(),
-                'min_salary': domain2_data['min_salary'].mean(),
-                'max_salary': domain2_data['max_salary'].mean(),
-                'top_companies': domain2_data['Company'].value_counts().head(5).to_dict(),
-                'top_locations': domain2_data['Location'].value_counts().head(5).to_dict()
-            }
-        }
-
-        return jsonify(comparison)
+        return Response(compare_payload(domain1, domain2), mimetype='application/json')
     except Exception as e:
         logging.error(f"Error in compare_domains: {e}")
         return jsonify({"error": str(e)}), 500
@@ -179,8 +280,7 @@ def compare_domains():
 @app.route('/api/locations', methods=['GET'])
 def get_locations():
     try:
-        locations = df['Location'].unique().tolist()
-        return jsonify(locations)
+        return cached_response('locations')
     except Exception as e:
         logging.error(f"Error in get_locations: {e}")
         return jsonify({"error": str(e)}), 500
@@ -190,17 +290,7 @@ def get_locations():
 @app.route('/api/key-insights', methods=['GET'])
 def get_key_insights():
     try:
-        insights = {
-            'top_paying_domain': df.groupby('Job Title')['avg_salary'].mean().sort_values(ascending=False).head(1).index[0] if not df.empty else None,
-            'top_hiring_domain': df['Job Title'].value_counts().index[0] if not df.empty else None,
-            'top_hiring_company': df['Company'].value_counts().index[0] if not df.empty else None,
-            'top_location': df['Location'].value_counts().index[0] if not df.empty else None,
-            'avg_internship_salary': df['avg_salary'].mean() if not df.empty else 0,
-            'total_companies': df['Company'].nunique() if not df.empty else 0,
-            'total_domains': df['Job Title'].nunique() if not df.empty else 0,
-            'total_listings': len(df)
-        }
-        return jsonify(insights)
+        return cached_response('key_insights')
     except Exception as e:
         logging.error(f"Error in get_key_insights: {e}")
         return jsonify({"error": str(e)}), 500
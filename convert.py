@@ -0,0 +1,10 @@
+import os
+from data_processor import load_data
+
+# One-time conversion of the raw CSV into a cleaned Parquet file loaded by app.py
+DATA_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'data')
+
+if __name__ == '__main__':
+    df = load_data(os.path.join(DATA_DIR, 'CleanedData.csv'))
+    df.to_parquet(os.path.join(DATA_DIR, 'Cleaned.parquet'), compression='zstd', index=False)
+    print(f"Wrote {len(df)} records to {os.path.join(DATA_DIR, 'Cleaned.parquet')}")
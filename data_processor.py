@@ -0,0 +1,64 @@
+import numpy as np
+import pandas as pd
+from numba import njit
+
+
+COLUMNS = ['Job Title', 'Location', 'Company', 'min_salary', 'max_salary', 'avg_salary']
+
+
+def load_data(csv_path):
+    df = pd.read_csv(csv_path, usecols=COLUMNS)
+
+    # Data Cleaning and Preprocessing
+    df = df.fillna({'min_salary': 0, 'max_salary': 0, 'avg_salary': 0})
+    for col in ['min_salary', 'max_salary', 'avg_salary']:
+        # Coerce before downcasting so malformed cells become NaN instead of failing the load
+        df[col] = pd.to_numeric(df[col], errors='coerce').astype('float32')
+    mask = (df['avg_salary'] == 0) & (df['min_salary'] > 0) & (df['max_salary'] > 0)
+    df.loc[mask, 'avg_salary'] = (df.loc[mask, 'min_salary'] + df.loc[mask, 'max_salary']) / 2
+    df['Location'] = df['Location'].str.extract(r'^\s*([^,]*?)\s*(?:,|$)', expand=False)
+    df['Job Title'] = df['Job Title'].str.strip()
+    for col in ['Job Title', 'Location', 'Company']:
+        df[col] = df[col].astype('category')
+
+    return df
+
+
+@njit(cache=True)
+def group_mean(codes, values, n):
+    # Mean of values per category code, skipping NaN values like groupby().mean();
+    # groups with no non-NaN values and missing keys (code -1) yield NaN
+    sums = np.zeros(n)
+    counts = np.zeros(n, dtype=np.int64)
+    for i in range(codes.shape[0]):
+        k = codes[i]
+        if k >= 0 and values[i] == values[i]:
+            sums[k] += values[i]
+            counts[k] += 1
+    means = np.empty(n)
+    for k in range(n):
+        means[k] = sums[k] / counts[k] if counts[k] > 0 else np.nan
+    return means
+
+
+@njit(cache=True)
+def build_mask(job_codes, loc_codes, salary, job_want, loc_want, min_sal):
+    # A negative wanted code means "All"; min_sal of -inf disables the salary filter.
+    # Serial on purpose: it is called from request threads, and without TBB numba's
+    # workqueue layer aborts on concurrent parallel calls.
+    out = np.empty(job_codes.shape[0], dtype=np.bool_)
+    for i in range(job_codes.shape[0]):
+        out[i] = ((job_want < 0 or job_codes[i] == job_want)
+                  and (loc_want < 0 or loc_codes[i] == loc_want)
+                  and (min_sal == -np.inf or salary[i] >= min_sal))
+    return out
+
+
+def numba_mean(values, index):
+    # User-defined aggregation for pandas' engine='numba'; skips NaN like agg('mean')
+    return np.nanmean(values)
+
+
+def category_means(key, values):
+    means = group_mean(key.cat.codes.values, values.values, len(key.cat.categories))
+    return pd.Series(means, index=key.cat.categories, name=values.name).dropna()